@@ -1,10 +1,8 @@
 # Standard library imports
-from typing import List, Tuple, Dict, Any
+from typing import Tuple, Dict, Any
 
 # Third-party imports
 import streamlit as st
-import numpy as np
-import pandas as pd
 
 # Local imports
 from utils import parse_salary_upgrades, parse_savings_rates
@@ -1,15 +1,12 @@
 # Standard library imports
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Tuple
 
 # Third-party imports
 import plotly.graph_objs as go
+import plotly.io as pio
 import streamlit as st
 import numpy as np
 
-# Local imports
-from calculations import project_retirement, monte_carlo_simulation
-
 
 def plot_net_worth_vs_time(projection: Dict[str, Any]) -> None:
 	fig = go.Figure()
@@ -33,9 +30,7 @@ def plot_income_vs_expenses_real(projection: Dict[str, Any], inputs: Dict[str, A
 	expenses = projection["expenses"]
 	starting_age = inputs["starting_age"]
 	# Compute cumulative inflation from starting age to each year
-	cumulative_inflation = np.ones(len(ages))
-	for i in range(len(ages)):
-		cumulative_inflation[i] = (1 + inputs["inflation"] / 100) ** (ages[i] - starting_age)
+	cumulative_inflation = (1 + inputs["inflation"] / 100) ** (ages - starting_age)
 	income_real = income / cumulative_inflation
 	expenses_real = expenses / cumulative_inflation
 	fig = go.Figure()
@@ -45,40 +40,67 @@ def plot_income_vs_expenses_real(projection: Dict[str, Any], inputs: Dict[str, A
 	st.plotly_chart(fig)
 
 
+@st.cache_data(show_spinner=False)
+def _bin_values(values: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+	return np.histogram(values, bins=bins)
+
+
+@st.cache_data(show_spinner=False)
+def _histogram_figure_json(values: np.ndarray, name: str, title: str, xaxis_title: str, scale: float = 1.0, bins: int = 50) -> str:
+	"""
+	Bin values with numpy and return the bar chart as serialized Plotly JSON,
+	so cache hits skip both the binning and the figure serialization.
+	Dividing values by a positive scale only rescales the bin edges, so scaled
+	charts of the same values reuse one binning.
+	"""
+	counts, edges = _bin_values(values, bins)
+	edges = edges / scale
+	fig = go.Figure()
+	fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), name=name))
+	fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title="Frequency")
+	return pio.to_json(fig)
+
+
+def plot_histogram(values: np.ndarray, name: str, title: str, xaxis_title: str, scale: float = 1.0) -> None:
+	"""Plot a histogram of values / scale."""
+	st.plotly_chart(pio.from_json(_histogram_figure_json(values, name, title, xaxis_title, scale)))
+
+
+def _format_export_value(v: Any) -> str:
+	return f"{v:,.2f}" if isinstance(v, (int, float)) else f"{v}"
+
+
 def export_simulation_details(inputs: Dict[str, Any], results: Dict[str, Any], filename: str = "simulation_export.txt") -> None:
 	"""
 	Export all key assumptions and projected outcomes to a text file.
+	The report is assembled in memory and written with a single write.
 	"""
+	lines = [
+		"Retirement Calculator Simulation Export",
+		"=" * 50,
+		"",
+		"INPUT ASSUMPTIONS:",
+		"-" * 20,
+		*[f"  {k}: {_format_export_value(v)}" for k, v in inputs.items()],
+		"",
+		"",
+		"PROJECTED OUTCOMES:",
+		"-" * 20,
+		*[f"  {k}: {_format_export_value(v)}" for k, v in results.items()],
+		"",
+		"",
+		"MONTE CARLO SIMULATION RESULTS:",
+		"-" * 30,
+		f"  Success Rate: {results.get('success_rate', 0)*100:.1f}%",
+		f"  Median Net Worth at Death: ${results.get('median_net_worth', 0):,.0f}",
+		f"  10th Percentile Net Worth at Death: ${results.get('percentile_10_net_worth', 0):,.0f}",
+		"",
+		"",
+		"NOTES:",
+		"-" * 6,
+		"- This simulation assumes no social security or pension income",
+		"- All amounts are in current dollars",
+		"- Monte Carlo simulation includes random variations in growth rates and inflation",
+	]
 	with open(filename, "w") as f:
-		f.write("Retirement Calculator Simulation Export\n")
-		f.write("=" * 50 + "\n\n")
-		
-		f.write("INPUT ASSUMPTIONS:\n")
-		f.write("-" * 20 + "\n")
-		for k, v in inputs.items():
-			if k == "salary_upgrades" and v:
-				f.write(f"  {k}: {v}\n")
-			elif isinstance(v, (int, float)):
-				f.write(f"  {k}: {v:,.2f}\n")
-			else:
-				f.write(f"  {k}: {v}\n")
-		
-		f.write("\n\nPROJECTED OUTCOMES:\n")
-		f.write("-" * 20 + "\n")
-		for k, v in results.items():
-			if isinstance(v, (int, float)):
-				f.write(f"  {k}: {v:,.2f}\n")
-			else:
-				f.write(f"  {k}: {v}\n")
-		
-		f.write("\n\nMONTE CARLO SIMULATION RESULTS:\n")
-		f.write("-" * 30 + "\n")
-		f.write(f"  Success Rate: {results.get('success_rate', 0)*100:.1f}%\n")
-		f.write(f"  Median Net Worth at Death: ${results.get('median_net_worth', 0):,.0f}\n")
-		f.write(f"  10th Percentile Net Worth at Death: ${results.get('percentile_10_net_worth', 0):,.0f}\n")
-		
-		f.write("\n\nNOTES:\n")
-		f.write("-" * 6 + "\n")
-		f.write("- This simulation assumes no social security or pension income\n")
-		f.write("- All amounts are in current dollars\n")
-		f.write("- Monte Carlo simulation includes random variations in growth rates and inflation\n") 
\ No newline at end of file
+		f.write("\n".join(lines) + "\n")
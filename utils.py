@@ -1,6 +1,9 @@
 # Standard library imports
 from typing import List, Tuple
 
+# Third-party imports
+import numpy as np
+
 
 def parse_salary_upgrades(s: str) -> List[Tuple[int, str, float]]:
 	"""
@@ -44,15 +47,30 @@ def get_savings_rate_at_age(age: int, savings_rates: List[Tuple[int, float]], de
 	if not savings_rates:
 		return default_rate
 	
-	# Sort rates by age to ensure we get the most recent applicable rate
-	sorted_rates = sorted(savings_rates, key=lambda x: x[0])
-	
-	# Find the most recent rate that applies to this age or earlier
+	# Find the most recent rate that applies to this age or earlier in a single
+	# pass, without sorting (for equal ages, the later entry wins)
+	applicable_age = None
 	applicable_rate = default_rate
-	for rate_age, rate in sorted_rates:
-		if rate_age <= age:
+	for rate_age, rate in savings_rates:
+		if rate_age <= age and (applicable_age is None or rate_age >= applicable_age):
+			applicable_age = rate_age
 			applicable_rate = rate
-		else:
-			break
 	
-	return applicable_rate 
\ No newline at end of file
+	return applicable_rate
+
+
+def get_savings_rate_series(ages: np.ndarray, savings_rates: List[Tuple[int, float]], default_rate: float) -> np.ndarray:
+	"""
+	Vectorized get_savings_rate_at_age: the savings rate for every age in ages,
+	looked up with a single np.searchsorted over the sorted rate ages.
+	"""
+	if not savings_rates:
+		return np.full(len(ages), default_rate, dtype=float)
+	
+	rate_ages, rates = np.array(savings_rates, dtype=float).T
+	order = np.argsort(rate_ages, kind="stable")
+	rate_ages, rates = rate_ages[order], rates[order]
+	
+	# Index of the most recent rate that applies to each age (-1 if none yet)
+	index = np.searchsorted(rate_ages, ages, side="right") - 1
+	return np.where(index >= 0, rates[np.maximum(index, 0)], default_rate) 
\ No newline at end of file